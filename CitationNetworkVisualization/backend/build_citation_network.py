@@ -3,6 +3,11 @@ import pandas as pd
 import ast
 import re
 import os
+import sys
+
+# 共享的语料加载器位于仓库根目录
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from corpus import load_corpus
 
 INPUT_FILE = "../../output_cleaned/vispub_final.csv"
 OUTPUT_DIR = "citation_network"
@@ -31,7 +36,8 @@ def parse_refs(x):
 
 
 # ---------- load data ----------
-df = pd.read_csv(INPUT_FILE)
+# 只读取建网需要的三列（ID 为 category，年份为 Int16），并使用缓存快照
+df = load_corpus("network", path=INPUT_FILE)
 
 required_cols = [
     "oa_openalex_id",
@@ -42,32 +48,22 @@ for c in required_cols:
     if c not in df.columns:
         raise KeyError(f"Missing column: {c}")
 
-df["wid"] = df["oa_openalex_id"].apply(normalize_wid)
-df["pub_year"] = pd.to_numeric(df["year"], errors="coerce").astype("Int64")
+df["wid"] = df["oa_openalex_id"].map(normalize_wid).astype(object)
+df["pub_year"] = df["year"]
 df["refs"] = df["oa_referenced_works_parsed"].apply(parse_refs)
 
 df = df.dropna(subset=["wid"])
 
 
 # ---------- build edges ----------
-edges = []
-
-for _, row in df.iterrows():
-    src = row["wid"]
-    src_year = row["pub_year"]
-
-    if not row["refs"]:
-        continue
-
-    for tgt in row["refs"]:
-        if tgt:
-            edges.append({
-                "source": src,
-                "target": tgt,
-                "source_year": src_year
-            })
-
-edges_df = pd.DataFrame(edges)
+# 每条引用一行；空引用列表 explode 后为 NaN，与无法解析的 ID 一起丢弃
+edges_df = (
+    df[["wid", "refs", "pub_year"]]
+    .explode("refs")
+    .dropna(subset=["refs"])
+    .rename(columns={"wid": "source", "refs": "target", "pub_year": "source_year"})
+    .reset_index(drop=True)
+)
 
 edges_df.to_csv(EDGE_FILE, index=False)
 print(f"✅ Edge list saved: {EDGE_FILE}  ({len(edges_df)} edges)")
@@ -87,16 +83,11 @@ if os.path.exists(timeline_file):
 else:
     citation_map = {}
 
-nodes = []
-for _, row in df.iterrows():
-    wid = row["wid"]
-    nodes.append({
-        "id": wid,
-        "year": row["pub_year"],
-        "total_citations": citation_map.get(wid, 0)
-    })
-
-nodes_df = pd.DataFrame(nodes).drop_duplicates("id")
+nodes_df = pd.DataFrame({
+    "id": df["wid"],
+    "year": df["pub_year"],
+    "total_citations": df["wid"].map(citation_map).fillna(0).astype("int64"),
+}).drop_duplicates("id")
 nodes_df.to_csv(NODE_FILE, index=False)
 
 print(f"✅ Node list saved: {NODE_FILE}  ({len(nodes_df)} nodes)")
@@ -0,0 +1,153 @@
+# community.py
+# 对每年的引用网络做社区发现（稀疏矩阵上的半同步标签传播），并跨年份对齐社区编号：
+#   - 用此前年份的划分作为初始标签（warm start），迭代次数很少
+#   - 按成员重合度把本年社区与上一年的社区一一匹配，得到稳定的社区 ID
+import os
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+YEARLY_DIR = "yearly_networks"
+
+MAX_ITER = 30
+TOL = 1e-3            # 本轮标签变化比例低于该值即视为收敛
+TIE_BONUS = 0.5       # 邻居计数为整数，+0.5 只在平局时让节点保留当前标签
+MIN_JACCARD = 0.2     # 与上一年社区的 Jaccard 重合度低于该值则视为新社区
+SEED = 42
+
+
+# ---------- helpers ----------
+def build_adjacency(ids, edges):
+    """无向、去重的稀疏邻接矩阵，节点顺序与 ids 一致"""
+    index = pd.Index(ids)
+    src = index.get_indexer(edges["source"])
+    tgt = index.get_indexer(edges["target"])
+    n = len(index)
+    a = sp.csr_matrix((np.ones(len(src), dtype=np.float32), (src, tgt)), shape=(n, n))
+    a = a + a.T
+    a.data[:] = 1.0
+    a.setdiag(0)
+    a.eliminate_zeros()
+    return a.tocsr()
+
+
+def greedy_coloring(adj):
+    """按度数从大到小的贪心着色；同色节点互不相邻，可以同时更新"""
+    indptr, indices = adj.indptr.tolist(), adj.indices.tolist()
+    colors = [-1] * adj.shape[0]
+    for i in np.argsort(-np.diff(adj.indptr), kind="stable").tolist():
+        used = {colors[j] for j in indices[indptr[i]:indptr[i + 1]]}
+        c = 0
+        while c in used:
+            c += 1
+        colors[i] = c
+    return np.asarray(colors)
+
+
+def label_propagation(adj, labels, rng):
+    """半同步标签传播：按颜色类依次（随机顺序）更新，每类内部用一次稀疏乘法同时更新。
+    引文网络近似二部图（施引论文 ↔ 被引文献），纯同步更新会让两侧每轮互换标签而不收敛；
+    同一颜色类内没有相邻节点，这种振荡不会出现。
+    返回 (labels, 迭代次数, 是否收敛)"""
+    n = adj.shape[0]
+    colors = greedy_coloring(adj)
+    classes = [np.flatnonzero(colors == c) for c in range(colors.max() + 1)]
+    all_rows = np.arange(n)
+    labels = labels.copy()
+
+    for it in range(1, MAX_ITER + 1):
+        changed = 0
+        for c in rng.permutation(len(classes)):
+            rows = classes[c]
+            uniq, codes = np.unique(labels, return_inverse=True)
+            onehot = sp.csr_matrix((np.ones(n, dtype=np.float32), (all_rows, codes)),
+                                   shape=(n, len(uniq)))
+            scores = (adj[rows] @ onehot + TIE_BONUS * onehot[rows]).tocsr()
+            new = uniq[np.asarray(scores.argmax(axis=1)).ravel()]
+            changed += int(np.count_nonzero(new != labels[rows]))
+            labels[rows] = new
+        if changed / n < TOL:
+            return labels, it, True
+    return labels, MAX_ITER, False
+
+
+def match_communities(ids, labels, prev, next_id):
+    """把本年的簇（labels）贪心地一一匹配到上一年的社区（prev: id → community）。
+    Jaccard 只在两年都出现的节点上计算，返回 (社区 ID 数组, next_id)"""
+    df = pd.DataFrame({"id": ids, "cluster": labels})
+    df["prev"] = df["id"].map(prev)
+    common = df.dropna(subset=["prev"])
+
+    sizes = common.groupby("cluster").size()
+    prev_sizes = common.groupby("prev").size()
+
+    overlap = common.groupby(["cluster", "prev"]).size().reset_index(name="overlap")
+    overlap["jaccard"] = overlap["overlap"] / (
+        overlap["cluster"].map(sizes) + overlap["prev"].map(prev_sizes) - overlap["overlap"]
+    )
+    overlap = overlap[overlap["jaccard"] >= MIN_JACCARD].sort_values("jaccard", ascending=False)
+
+    assigned, used = {}, set()
+    for cluster, p in zip(overlap["cluster"], overlap["prev"]):
+        if cluster in assigned or p in used:
+            continue
+        assigned[cluster] = int(p)
+        used.add(p)
+
+    for cluster in pd.unique(df["cluster"]):
+        if cluster not in assigned:
+            assigned[cluster] = next_id
+            next_id += 1
+
+    return df["cluster"].map(assigned).to_numpy(), next_id
+
+
+# ---------- 逐年运行 ----------
+years = sorted(
+    int(name[len("edges_"):-len(".csv")])
+    for name in os.listdir(YEARLY_DIR)
+    if name.startswith("edges_") and name.endswith(".csv")
+)
+
+memory = {}     # 论文 id → 最近一次所属社区（跨年份累积，用于 warm start）
+prev = {}       # 上一年的划分，用于社区匹配
+next_id = 0
+rng = np.random.default_rng(SEED)
+not_converged = []
+
+for year in years:
+    edges = pd.read_csv(os.path.join(YEARLY_DIR, f"edges_{year}.csv"), usecols=["source", "target"]).dropna()
+    nodes_file = os.path.join(YEARLY_DIR, f"nodes_{year}.csv")
+    node_ids = pd.read_csv(nodes_file, usecols=["id"])["id"] if os.path.exists(nodes_file) else pd.Series(dtype=object)
+
+    ids = pd.unique(pd.concat([node_ids, edges["source"], edges["target"]], ignore_index=True).dropna())
+    if len(ids) == 0:
+        continue
+
+    adj = build_adjacency(ids, edges)
+
+    # warm start：已见过的节点沿用其社区 ID，新节点各自一个临时负数标签
+    init = pd.Series(ids).map(memory)
+    fresh = init.isna().to_numpy()
+    labels = init.fillna(-1).to_numpy(dtype=np.int64)
+    labels[fresh] = -1 - np.arange(fresh.sum())
+
+    labels, iters, converged = label_propagation(adj, labels, rng)
+    communities, next_id = match_communities(ids, labels, prev, next_id)
+    n_comm = len(np.unique(communities))
+    reused = len(set(communities.tolist()) & set(prev.values()))
+
+    prev = dict(zip(ids, communities.tolist()))
+    memory.update(prev)
+
+    pd.DataFrame({"id": ids, "community": communities}).to_csv(
+        os.path.join(YEARLY_DIR, f"communities_{year}.csv"), index=False)
+
+    status = f"converged in {iters} iterations" if converged else f"⚠ NOT converged after {MAX_ITER} iterations"
+    if not converged:
+        not_converged.append(year)
+    print(f"✔ {year}: nodes={len(ids)}, communities={n_comm} (reused {reused}), {status}")
+
+print(f"✅ 社区划分完成，共 {next_id} 个社区 ID")
+if not_converged:
+    print(f"⚠ 以下年份在 {MAX_ITER} 轮内未收敛，结果仅供参考: {not_converged}")
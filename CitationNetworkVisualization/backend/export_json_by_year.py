@@ -1,12 +1,82 @@
 import pandas as pd
 import os
 import json
+import hashlib
+import argparse
+from collections import Counter
 
 YEARLY_DIR = "yearly_networks"
 OUTPUT_DIR = "../web/data"
+DELTA_DIR = os.path.join(OUTPUT_DIR, "delta")
+MANIFEST_FILE = os.path.join(OUTPUT_DIR, "manifest.json")
 
 
+# 节点大小 / 颜色使用的引用数：
+#   corpus : 语料库内被引次数（count.py 的 total_citations，默认）
+#   global : OpenAlex 全局 cited_by_count（resolve_external_nodes.py 写入，缺失时退回 corpus）
+parser = argparse.ArgumentParser()
+parser.add_argument("--citations", choices=["corpus", "global"], default="corpus")
+args = parser.parse_args()
+
 os.makedirs(OUTPUT_DIR, exist_ok=True)
+os.makedirs(DELTA_DIR, exist_ok=True)
+
+
+def sha1(text):
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def write_if_changed(path, text, old_entry):
+    """内容哈希与上次 manifest 一致且文件仍在时跳过写入，返回 (entry, written)"""
+    entry = {"file": os.path.relpath(path, OUTPUT_DIR).replace(os.sep, "/"),
+             "sha1": sha1(text),
+             "bytes": len(text.encode("utf-8"))}
+    if (old_entry and old_entry.get("sha1") == entry["sha1"]
+            and os.path.exists(path) and os.path.getsize(path) == entry["bytes"]):
+        return entry, False
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+    return entry, True
+
+
+def graph_delta(prev, graph):
+    """相对上一年的增量：节点按 id 比较（属性变化记为 changed），边按多重集比较。
+    split_by_year.py 按 source_year 拆分边，相邻年份的边集合通常完全不相交，
+    此时列出增删反而比全量更大，改为直接给出本年全部边（links）"""
+    prev_nodes = {n["id"]: n for n in prev["nodes"]}
+    cur_nodes = {n["id"]: n for n in graph["nodes"]}
+
+    delta = {
+        "nodes_added": [n for i, n in cur_nodes.items() if i not in prev_nodes],
+        "nodes_removed": [i for i in prev_nodes if i not in cur_nodes],
+        "nodes_changed": [n for i, n in cur_nodes.items()
+                          if i in prev_nodes and prev_nodes[i] != n],
+    }
+
+    prev_links = Counter((l["source"], l["target"]) for l in prev["links"])
+    cur_links = Counter((l["source"], l["target"]) for l in graph["links"])
+    added = cur_links - prev_links
+    removed = prev_links - cur_links
+
+    if sum(added.values()) + sum(removed.values()) >= len(graph["links"]):
+        delta["links"] = graph["links"]
+    else:
+        delta["links_added"] = [{"source": s, "target": t}
+                                for (s, t), c in added.items() for _ in range(c)]
+        delta["links_removed"] = [{"source": s, "target": t}
+                                  for (s, t), c in removed.items() for _ in range(c)]
+    return delta
+
+
+# ---------- 上一次导出的 manifest ----------
+old_manifest = {}
+if os.path.exists(MANIFEST_FILE):
+    with open(MANIFEST_FILE, encoding="utf-8") as f:
+        old_manifest = {str(e["year"]): e for e in json.load(f).get("years", [])}
+
+manifest = []
+prev_year, prev_graph = None, None
+written = skipped = 0
 
 for year in range(1986, 2026):
     nodes_file = f"{YEARLY_DIR}/nodes_{year}.csv"
@@ -25,26 +95,66 @@ for year in range(1986, 2026):
 
     if missing:
         print(f"{year}: repairing {len(missing)} missing nodes")
-
-    for mid in missing:
         nodes = pd.concat([
             nodes,
-            pd.DataFrame([{
-                "id": mid,
+            pd.DataFrame({
+                "id": sorted(missing),
                 "year": year,
                 "total_citations": 0
-            }])
+            })
         ], ignore_index=True)
 
+    citations = nodes["total_citations"].fillna(0)
+    if args.citations == "global" and "cited_by_count" in nodes.columns:
+        citations = nodes["cited_by_count"].fillna(citations)
+
+    # ------ community.py 的跨年稳定社区 ID ------
+    communities_file = f"{YEARLY_DIR}/communities_{year}.csv"
+    if os.path.exists(communities_file):
+        comm = pd.read_csv(communities_file)
+        community = dict(zip(comm["id"], comm["community"]))
+        node_list = [{"id": i, "citations": int(c), "community": int(community[i])}
+                     if i in community else {"id": i, "citations": int(c)}
+                     for i, c in zip(nodes["id"], citations)]
+    else:
+        node_list = [{"id": i, "citations": int(c)}
+                     for i, c in zip(nodes["id"], citations)]
+
     graph = {
-        "nodes": [{"id": r["id"], "citations": int(r["total_citations"])} 
-                   for _, r in nodes.iterrows()],
-        "links": [{"source": s, "target": t} 
+        "nodes": node_list,
+        "links": [{"source": s, "target": t}
                   for s, t in zip(edges["source"], edges["target"])]
     }
 
-    json.dump(
-        graph,
-        open(f"{OUTPUT_DIR}/{year}.json", "w"),
-        indent=2
-    )
+    old = old_manifest.get(str(year), {})
+    entry, changed = write_if_changed(
+        f"{OUTPUT_DIR}/{year}.json", json.dumps(graph, indent=2), old)
+    entry.update(year=year, nodes=len(graph["nodes"]), links=len(graph["links"]))
+
+    # ------ 相对上一个导出年份的增量 ------
+    # 只有增量比前端实际下载的全量文件（entry["bytes"]）更小时才使用，
+    # 否则 manifest 中不登记 delta，前端直接下载全量文件
+    delta_path = os.path.join(DELTA_DIR, f"{year}.json")
+    use_delta = False
+    if prev_graph is not None:
+        delta = {"year": year, "base": prev_year, **graph_delta(prev_graph, graph)}
+        delta_text = json.dumps(delta, separators=(",", ":"))
+        use_delta = len(delta_text.encode("utf-8")) < entry["bytes"]
+
+    if use_delta:
+        delta_entry, delta_changed = write_if_changed(delta_path, delta_text, old.get("delta"))
+        entry["delta"] = dict(delta_entry, base=prev_year)
+        changed = changed or delta_changed
+    elif os.path.exists(delta_path):
+        os.remove(delta_path)
+        changed = True
+
+    manifest.append(entry)
+    written += changed
+    skipped += not changed
+    prev_year, prev_graph = year, graph
+
+with open(MANIFEST_FILE, "w", encoding="utf-8") as f:
+    json.dump({"years": manifest}, f, indent=2)
+
+print(f"✅ Exported {len(manifest)} years ({written} written, {skipped} unchanged) → {MANIFEST_FILE}")
@@ -5,7 +5,7 @@ import os
 import argparse
 
 
-def plot_year(year, data_dir="yearly_networks"):
+def plot_year(year, data_dir="yearly_networks", show=True):
     nodes_file = os.path.join(data_dir, f"nodes_{year}.csv")
     edges_file = os.path.join(data_dir, f"edges_{year}.csv")
 
@@ -109,12 +109,16 @@ def plot_year(year, data_dir="yearly_networks"):
         )
     )
 
-    fig.show()
+    if show:
+        fig.show()
+    return fig
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("--year", type=int, required=True)
+    parser.add_argument("--no-show", action="store_true",
+                        help="只计算布局和图形，不打开浏览器（用于基准测试）")
     args = parser.parse_args()
 
-    plot_year(args.year)
+    plot_year(args.year, show=not args.no_show)
@@ -0,0 +1,145 @@
+# resolve_external_nodes.py
+# 为语料库之外的被引文献（边的 target 不在节点表中）批量补齐 year / title / cited_by_count
+import os
+import json
+import time
+import requests
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+OUTPUT_DIR = "citation_network"
+
+EDGE_FILE = os.path.join(OUTPUT_DIR, "citation_edges.csv")
+NODE_FILE = os.path.join(OUTPUT_DIR, "nodes_with_citations.csv")
+FALLBACK_NODE_FILE = os.path.join(OUTPUT_DIR, "citation_nodes.csv")
+
+CACHE_FILE = os.path.join(OUTPUT_DIR, "external_works_cache.jsonl")
+ENRICHED_FILE = os.path.join(OUTPUT_DIR, "nodes_enriched.csv")
+
+API_URL = "https://api.openalex.org/works"
+BATCH_SIZE = 50          # OpenAlex pipe-filter：每次请求最多 50 个 ID
+CONCURRENCY = 4
+SLEEP_BETWEEN_REQUESTS = 0.25
+MAX_RETRIES = 3
+TIMEOUT = 20
+HEADERS = {"User-Agent": "YourName/1.0 (mailto:xzxq1027@gmail.com)"}
+
+
+# ---------- helpers ----------
+def load_cache():
+    """读取已解析过的外部节点；未被 OpenAlex 找到的 ID 也会缓存（year 为 null），避免重复请求"""
+    cache = {}
+    if not os.path.exists(CACHE_FILE):
+        return cache
+    with open(CACHE_FILE, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                rec = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # 中断时可能留下半行
+            cache[rec["id"]] = rec
+    return cache
+
+
+def fetch_batch(wids):
+    """一次请求解析一批 ID，返回 {wid: record}；多次重试仍失败则抛出异常"""
+    params = {
+        "filter": "openalex:" + "|".join(wids),
+        "per-page": len(wids),
+        "select": "id,title,publication_year,cited_by_count",
+    }
+    last_err = None
+    for attempt in range(MAX_RETRIES):
+        try:
+            r = requests.get(API_URL, params=params, timeout=TIMEOUT, headers=HEADERS)
+            if r.status_code == 200:
+                found = {}
+                for work in r.json().get("results", []):
+                    wid = str(work.get("id", "")).rsplit("/", 1)[-1]
+                    found[wid] = {
+                        "id": wid,
+                        "year": work.get("publication_year"),
+                        "title": work.get("title"),
+                        "cited_by_count": work.get("cited_by_count"),
+                    }
+                time.sleep(SLEEP_BETWEEN_REQUESTS)
+                # 已合并 / 删除的作品不会出现在结果中，记为未解析
+                return {
+                    w: found.get(w, {"id": w, "year": None, "title": None, "cited_by_count": None})
+                    for w in wids
+                }
+            last_err = ("http_error", r.status_code)
+            if r.status_code == 429:
+                time.sleep(10)
+        except Exception as e:
+            last_err = ("network_error", str(e))
+        time.sleep(1.5 * (attempt + 1))
+    raise RuntimeError(last_err)
+
+
+# ---------- load data ----------
+edges = pd.read_csv(EDGE_FILE, usecols=["target"])
+nodes = pd.read_csv(NODE_FILE if os.path.exists(NODE_FILE) else FALLBACK_NODE_FILE)
+
+corpus_ids = set(nodes["id"])
+external_ids = sorted(set(edges["target"].dropna().unique()) - corpus_ids)
+
+cache = load_cache()
+todo = [w for w in external_ids if w not in cache]
+
+print(f"📌 External targets = {len(external_ids)}, cached = {len(external_ids) - len(todo)}, to fetch = {len(todo)}")
+
+
+# ---------- batched, concurrent fetch ----------
+batches = [todo[i:i + BATCH_SIZE] for i in range(0, len(todo), BATCH_SIZE)]
+failed_batches = 0
+
+with open(CACHE_FILE, "a", encoding="utf-8") as cache_f, \
+        ThreadPoolExecutor(max_workers=CONCURRENCY) as pool:
+    futures = {pool.submit(fetch_batch, b): b for b in batches}
+    for i, fut in enumerate(as_completed(futures), 1):
+        try:
+            records = fut.result()
+        except Exception as e:
+            failed_batches += 1
+            print(f"❌ Batch failed ({len(futures[fut])} ids), reason={e}")
+            continue
+
+        # 只在主线程写缓存，保证每行完整
+        for rec in records.values():
+            cache[rec["id"]] = rec
+            cache_f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+        cache_f.flush()
+
+        if i % 100 == 0 or i == len(futures):
+            print(f"✔ {i}/{len(futures)} batches")
+
+
+# ---------- write enriched node table ----------
+ext = pd.DataFrame(
+    [cache[w] for w in external_ids if w in cache],
+    columns=["id", "year", "title", "cited_by_count"],
+)
+ext["year"] = pd.to_numeric(ext["year"], errors="coerce").astype("Int64")
+# cited_by_count 是 OpenAlex 全局被引数，单独成列；total_citations 与 count.py 一致，
+# 只统计语料库内的引用，两者不可混在同一列
+ext["cited_by_count"] = pd.to_numeric(ext["cited_by_count"], errors="coerce").astype("Int64")
+in_corpus = edges["target"].value_counts()
+ext["total_citations"] = ext["id"].map(in_corpus).fillna(0).astype(int)
+ext["external"] = True
+
+nodes["external"] = False
+if "title" not in nodes.columns:
+    nodes["title"] = pd.NA
+if "cited_by_count" not in nodes.columns:
+    nodes["cited_by_count"] = pd.NA
+
+enriched = pd.concat([nodes, ext], ignore_index=True).drop_duplicates("id")
+enriched.to_csv(ENRICHED_FILE, index=False)
+
+resolved = int(ext["year"].notna().sum())
+print(f"✅ Enriched node list saved: {ENRICHED_FILE}  ({len(enriched)} nodes, "
+      f"{resolved}/{len(external_ids)} external resolved, {failed_batches} failed batches)")
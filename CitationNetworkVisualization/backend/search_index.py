@@ -0,0 +1,181 @@
+# search_index.py
+# 离线构建论文标题（可选作者）的倒排索引，BM25 排序 + 前缀匹配
+#
+# 构建：python search_index.py [--authors]
+# 查询：
+#   from search_index import SearchIndex
+#   SearchIndex().search("graph layo", k=10)   # → [(work_id, score), ...]
+#
+# 索引目录中的数组均为 .npy，通过 np.load(mmap_mode="r") 按需映射，无需整体读入内存
+import os
+import re
+import json
+import bisect
+import argparse
+import unicodedata
+import sys
+import numpy as np
+import pandas as pd
+
+# 共享的语料加载器位于仓库根目录
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from corpus import STAGE_COLUMNS, load_corpus
+
+INPUT_FILE = "../../output_cleaned/vispub_final.csv"
+INDEX_DIR = "search_index"
+WEB_SHARD = "../web/data/search.json"
+
+K1 = 1.2
+B = 0.75
+MAX_PREFIX_TERMS = 50   # 前缀最多展开成文档频率最高的若干个词
+
+
+# ---------- helpers ----------
+def normalize_wid(x):
+    if pd.isna(x):
+        return None
+    m = re.search(r"W\d+", str(x))
+    return m.group(0) if m else None
+
+
+def tokenize(text):
+    """去重音、小写、按字母数字切分。
+    去掉所有 Unicode 标记类字符（类别 M*），与前端 main.js 中的 /\p{M}/gu 保持一致"""
+    if text is None or (not isinstance(text, str) and pd.isna(text)):
+        return []
+    text = unicodedata.normalize("NFKD", str(text))
+    text = "".join(ch for ch in text if not unicodedata.category(ch).startswith("M")).lower()
+    return re.findall(r"[a-z0-9]+", text)
+
+
+# ---------- build ----------
+def build_index(df, with_authors=False, index_dir=INDEX_DIR):
+    """df 需包含 wid / year / title（以及可选的 authorNamesDeduped）"""
+    os.makedirs(index_dir, exist_ok=True)
+
+    postings = {}           # term → {doc: tf}
+    doc_len = np.zeros(len(df), dtype=np.uint16)
+    for doc, (title, authors) in enumerate(zip(
+            df["title"], df["authorNamesDeduped"] if with_authors else [None] * len(df))):
+        tokens = tokenize(title) + tokenize(authors)
+        doc_len[doc] = min(len(tokens), np.iinfo(np.uint16).max)
+        for t in tokens:
+            tf = postings.setdefault(t, {})
+            tf[doc] = tf.get(doc, 0) + 1
+
+    vocab = sorted(postings)
+    offsets = np.zeros(len(vocab) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(postings[t]) for t in vocab])
+    docs = np.empty(offsets[-1], dtype=np.int32)
+    tfs = np.empty(offsets[-1], dtype=np.uint16)
+    for i, t in enumerate(vocab):
+        items = sorted(postings[t].items())
+        docs[offsets[i]:offsets[i + 1]] = [d for d, _ in items]
+        tfs[offsets[i]:offsets[i + 1]] = [min(c, 65535) for _, c in items]
+
+    np.save(os.path.join(index_dir, "offsets.npy"), offsets)
+    np.save(os.path.join(index_dir, "docs.npy"), docs)
+    np.save(os.path.join(index_dir, "tfs.npy"), tfs)
+    np.save(os.path.join(index_dir, "doc_len.npy"), doc_len)
+    with open(os.path.join(index_dir, "vocab.txt"), "w", encoding="utf-8") as f:
+        f.write("\n".join(vocab))
+    df[["wid", "year", "title"]].to_csv(os.path.join(index_dir, "docs.csv"), index=False)
+    with open(os.path.join(index_dir, "meta.json"), "w") as f:
+        json.dump({"n_docs": len(df), "n_terms": len(vocab),
+                   "avgdl": float(doc_len.mean()) if len(df) else 0.0,
+                   "authors": with_authors}, f)
+
+    return vocab, offsets, docs, tfs, doc_len
+
+
+def write_web_shard(df, vocab, offsets, docs, tfs, doc_len, path=WEB_SHARD):
+    """给前端的紧凑索引：postings 为 [doc, tf, doc, tf, ...] 扁平数组"""
+    shard = {
+        # 排序参数随索引下发，前端与 SearchIndex 使用同一组值
+        "params": {"k1": K1, "b": B, "max_prefix_terms": MAX_PREFIX_TERMS},
+        "avgdl": float(doc_len.mean()) if len(doc_len) else 0.0,
+        "docs": [[w, None if pd.isna(y) else int(y), t]
+                 for w, y, t in zip(df["wid"], df["year"], df["title"])],
+        "doc_len": doc_len.tolist(),
+        "vocab": vocab,
+        "postings": [
+            np.column_stack((docs[offsets[i]:offsets[i + 1]], tfs[offsets[i]:offsets[i + 1]])).ravel().tolist()
+            for i in range(len(vocab))
+        ],
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(shard, f, ensure_ascii=False, separators=(",", ":"))
+
+
+# ---------- query ----------
+class SearchIndex:
+    def __init__(self, index_dir=INDEX_DIR):
+        with open(os.path.join(index_dir, "meta.json")) as f:
+            self.meta = json.load(f)
+        with open(os.path.join(index_dir, "vocab.txt"), encoding="utf-8") as f:
+            self.vocab = f.read().split("\n") if self.meta["n_terms"] else []
+        self.offsets = np.load(os.path.join(index_dir, "offsets.npy"), mmap_mode="r")
+        self.docs = np.load(os.path.join(index_dir, "docs.npy"), mmap_mode="r")
+        self.tfs = np.load(os.path.join(index_dir, "tfs.npy"), mmap_mode="r")
+        self.doc_len = np.asarray(np.load(os.path.join(index_dir, "doc_len.npy"), mmap_mode="r"), dtype=np.float64)
+        self.wids = pd.read_csv(os.path.join(index_dir, "docs.csv"), usecols=["wid"])["wid"].to_numpy()
+
+        # BM25 中与词无关的长度归一化项，预先算好
+        avgdl = self.meta["avgdl"] or 1.0
+        self.norm = K1 * (1 - B + B * self.doc_len / avgdl)
+
+    def _terms(self, token, prefix):
+        """精确词或前缀展开后的词下标"""
+        lo = bisect.bisect_left(self.vocab, token)
+        if not prefix:
+            return [lo] if lo < len(self.vocab) and self.vocab[lo] == token else []
+        hi = bisect.bisect_left(self.vocab, token + "\uffff")
+        terms = range(lo, hi)
+        if len(terms) > MAX_PREFIX_TERMS:
+            df = np.diff(self.offsets)[lo:hi]
+            terms = lo + np.argsort(-df, kind="stable")[:MAX_PREFIX_TERMS]
+        return list(terms)
+
+    def search(self, query, k=10, prefix=True):
+        """返回 [(work_id, score), ...]；prefix=True 时最后一个词按前缀匹配（边输入边搜索）"""
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        n = self.meta["n_docs"]
+        scores = np.zeros(n, dtype=np.float64)
+        for j, token in enumerate(tokens):
+            for t in self._terms(token, prefix and j == len(tokens) - 1):
+                lo, hi = self.offsets[t], self.offsets[t + 1]
+                docs = self.docs[lo:hi]
+                tf = self.tfs[lo:hi].astype(np.float64)
+                idf = np.log(1 + (n - (hi - lo) + 0.5) / ((hi - lo) + 0.5))
+                scores[docs] += idf * tf * (K1 + 1) / (tf + self.norm[docs])
+
+        # 分数相同按文档下标排序，与前端一致
+        hits = np.flatnonzero(scores)
+        hits = hits[np.lexsort((hits, -scores[hits]))][:k]
+        return [(self.wids[d], float(scores[d])) for d in hits]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--authors", action="store_true", help="同时索引作者名")
+    parser.add_argument("--query", help="构建后执行一次查询，检查结果")
+    args = parser.parse_args()
+
+    # 不索引作者时不读取 authorNamesDeduped 这一大列
+    cols = [c for c in STAGE_COLUMNS["search"] if args.authors or c != "authorNamesDeduped"]
+    df = load_corpus("search", columns=cols, path=INPUT_FILE)
+    df["wid"] = df["oa_openalex_id"].map(normalize_wid).astype(object)
+    df = df.dropna(subset=["wid"]).drop_duplicates("wid").reset_index(drop=True)
+
+    vocab, offsets, docs, tfs, doc_len = build_index(df, with_authors=args.authors)
+    print(f"✅ Search index saved: {INDEX_DIR}  ({len(df)} docs, {len(vocab)} terms, {len(docs)} postings)")
+
+    os.makedirs(os.path.dirname(WEB_SHARD), exist_ok=True)
+    write_web_shard(df, vocab, offsets, docs, tfs, doc_len)
+    print(f"✅ Web search shard saved: {WEB_SHARD}  ({os.path.getsize(WEB_SHARD) / 1024:.0f} KB)")
+
+    if args.query:
+        for wid, score in SearchIndex().search(args.query):
+            print(f"  {score:6.2f}  {wid}")
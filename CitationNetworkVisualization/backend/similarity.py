@@ -0,0 +1,119 @@
+# similarity.py
+# 基于引用边表计算两种论文相似度（稀疏矩阵、分块、每篇只保留 top-k）：
+#   文献耦合 bibliographic coupling：两篇论文共同引用的文献数，A·Aᵀ（行 = 施引论文）
+#   共被引   co-citation：          两篇文献被同一论文共同引用的次数，Aᵀ·A（行 = 被引文献）
+import os
+import argparse
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from concurrent.futures import ProcessPoolExecutor
+
+EDGE_FILE = "citation_network/citation_edges.csv"
+OUTPUT_DIR = "citation_network"
+YEARLY_DIR = "yearly_networks"
+
+COUPLING_FILE = os.path.join(OUTPUT_DIR, "similarity_coupling.csv")
+COCITATION_FILE = os.path.join(OUTPUT_DIR, "similarity_cocitation.csv")
+
+
+# ---------- worker ----------
+_M = None
+_MT = None
+
+
+def _init_worker(m):
+    # 每个进程只接收一次矩阵，之后各块共享
+    global _M, _MT
+    _M = m
+    _MT = m.T.tocsr()
+
+
+def topk_chunk(r0, r1, k, min_weight):
+    """计算 M[r0:r1] · Mᵀ，去掉自身，每行保留权重最大的 k 个邻居"""
+    block = (_M[r0:r1] @ _MT).tocsr()
+    rows, cols, weights = [], [], []
+    for i in range(block.shape[0]):
+        lo, hi = block.indptr[i], block.indptr[i + 1]
+        idx = block.indices[lo:hi]
+        w = block.data[lo:hi]
+        keep = (idx != r0 + i) & (w >= min_weight)
+        idx, w = idx[keep], w[keep]
+        if len(w) > k:
+            top = np.argpartition(-w, k - 1)[:k]
+            idx, w = idx[top], w[top]
+        order = np.lexsort((idx, -w))
+        rows.append(np.full(len(order), r0 + i, dtype=np.int64))
+        cols.append(idx[order])
+        weights.append(w[order])
+    if not rows:
+        return np.empty(0, np.int64), np.empty(0, np.int64), np.empty(0, np.float32)
+    return np.concatenate(rows), np.concatenate(cols), np.concatenate(weights)
+
+
+def chunked_topk(m, k, min_weight, chunk_rows, workers):
+    """按行分块在进程池上计算 m·mᵀ 的 top-k，返回 (row, col, weight) 数组"""
+    n = m.shape[0]
+    starts = list(range(0, n, chunk_rows))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(m,)) as pool:
+        parts = list(pool.map(
+            topk_chunk, starts, [min(s + chunk_rows, n) for s in starts],
+            [k] * len(starts), [min_weight] * len(starts)))
+    if not parts:
+        return np.empty(0, np.int64), np.empty(0, np.int64), np.empty(0, np.float32)
+    return tuple(np.concatenate(p) for p in zip(*parts))
+
+
+def to_frame(labels, rows, cols, weights):
+    return pd.DataFrame({
+        "source": labels[rows],
+        "target": labels[cols],
+        "weight": weights.astype(int),
+    })
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--top-k", type=int, default=20)
+    parser.add_argument("--min-weight", type=int, default=2,
+                        help="共同引用 / 共被引次数至少为该值才保留")
+    parser.add_argument("--chunk-rows", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    # ---------- 稀疏引用矩阵 ----------
+    edges = pd.read_csv(EDGE_FILE, usecols=["source", "target"]).dropna().drop_duplicates()
+    src_codes, src_labels = pd.factorize(edges["source"])
+    tgt_codes, tgt_labels = pd.factorize(edges["target"])
+    src_labels = np.asarray(src_labels, dtype=object)
+    tgt_labels = np.asarray(tgt_labels, dtype=object)
+
+    A = sp.csr_matrix(
+        (np.ones(len(edges), dtype=np.float32), (src_codes, tgt_codes)),
+        shape=(len(src_labels), len(tgt_labels)),
+    )
+    print(f"📐 Citation matrix: {A.shape[0]} citing × {A.shape[1]} cited, nnz={A.nnz}")
+
+    # ---------- 文献耦合：A·Aᵀ ----------
+    r, c, w = chunked_topk(A, args.top_k, args.min_weight, args.chunk_rows, args.workers)
+    coupling = to_frame(src_labels, r, c, w)
+    coupling.to_csv(COUPLING_FILE, index=False)
+    print(f"✅ Bibliographic coupling saved: {COUPLING_FILE}  ({len(coupling)} pairs)")
+
+    # ---------- 共被引：Aᵀ·A ----------
+    r, c, w = chunked_topk(A.T.tocsr(), args.top_k, args.min_weight, args.chunk_rows, args.workers)
+    cocitation = to_frame(tgt_labels, r, c, w)
+    cocitation.to_csv(COCITATION_FILE, index=False)
+    print(f"✅ Co-citation saved: {COCITATION_FILE}  ({len(cocitation)} pairs)")
+
+    # ---------- 按年拆分，与 yearly_networks 中的节点对齐 ----------
+    sim = pd.concat([coupling.assign(kind="coupling"), cocitation.assign(kind="cocitation")],
+                    ignore_index=True)
+    for name in sorted(os.listdir(YEARLY_DIR)):
+        if not (name.startswith("nodes_") and name.endswith(".csv")):
+            continue
+        year = name[len("nodes_"):-len(".csv")]
+        ids = set(pd.read_csv(os.path.join(YEARLY_DIR, name), usecols=["id"])["id"])
+        sim_year = sim[sim["source"].isin(ids) & sim["target"].isin(ids)]
+        sim_year.to_csv(os.path.join(YEARLY_DIR, f"similar_{year}.csv"), index=False)
+        print(f"✔ {year}: similar pairs={len(sim_year)}")
@@ -6,6 +6,8 @@ import os
 # =========================
 EDGES_FILE = "citation_network/citation_edges.csv"
 NODES_FILE = "citation_network/nodes_with_citations.csv"
+# resolve_external_nodes.py 的输出：包含语料外被引文献的真实 year / 引用数
+ENRICHED_NODES_FILE = "citation_network/nodes_enriched.csv"
 
 # =========================
 # 输出目录
@@ -17,6 +19,9 @@ os.makedirs(OUTPUT_DIR, exist_ok=True)
 # 读取数据
 # =========================
 edges = pd.read_csv(EDGES_FILE)
+if os.path.exists(ENRICHED_NODES_FILE):
+    NODES_FILE = ENRICHED_NODES_FILE
+    print(f"📎 使用补全后的节点表: {NODES_FILE}")
 nodes = pd.read_csv(NODES_FILE)
 
 # 基本校验（防止悄悄出错）
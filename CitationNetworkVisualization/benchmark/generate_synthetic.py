@@ -0,0 +1,128 @@
+# generate_synthetic.py
+# 生成与 vispub_final.csv / citation_timeline_wide.csv 同结构的合成数据，用于后端扩展性测试
+#
+# 目录结构与真实仓库一致，后端脚本中的相对路径可直接使用：
+#   <root>/output_cleaned/vispub_final.csv
+#   <root>/citation_timeline/citation_timeline_wide.csv
+import os
+import csv
+import math
+import random
+import argparse
+from array import array
+
+YEAR_MIN = 1986
+YEAR_MAX = 2025
+YEAR_RANGE = list(range(YEAR_MIN, YEAR_MAX + 1))
+
+CORPUS_ID_BASE = 1_000_000_000
+EXTERNAL_ID_BASE = 3_000_000_000
+
+
+def papers_per_year(n_papers, growth):
+    """按指数增长把 n_papers 篇论文分配到各年份"""
+    weights = [math.exp(growth * (y - YEAR_MIN)) for y in YEAR_RANGE]
+    total = sum(weights)
+    counts = [int(n_papers * w / total) for w in weights]
+    counts[-1] += n_papers - sum(counts)
+    return counts
+
+
+def generate(root, n_edges, mean_refs=20, external_frac=0.5, pa_prob=0.8,
+             growth=0.08, abstract_words=120, seed=42):
+    rng = random.Random(seed)
+    n_papers = max(1, n_edges // mean_refs)
+    years = [y for y, c in zip(YEAR_RANGE, papers_per_year(n_papers, growth)) for _ in range(c)]
+
+    out_clean = os.path.join(root, "output_cleaned")
+    out_timeline = os.path.join(root, "citation_timeline")
+    os.makedirs(out_clean, exist_ok=True)
+    os.makedirs(out_timeline, exist_ok=True)
+
+    # 优先连接：每被引用一次就在列表中追加一次，均匀抽样即按入度成比例
+    cited_corpus = array("q")
+    cited_external = array("q")
+    n_external = 0
+    # 语料内每篇论文按年份的被引次数（只为被引过的论文分配）
+    timeline = {}
+
+    words = ["visual", "analytics", "graph", "network", "interactive", "volume",
+             "rendering", "data", "exploration", "uncertainty", "layout", "model"]
+    abstract = " ".join(rng.choice(words) for _ in range(abstract_words))
+
+    edges_written = 0
+    with open(os.path.join(out_clean, "vispub_final.csv"), "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(["conference", "year", "title", "doi", "abstract", "authorNamesDeduped",
+                    "oa_title", "oa_openalex_id", "oa_publication_year", "oa_referenced_works_parsed"])
+
+        for i, year in enumerate(years):
+            # 引用数量服从指数分布，最后一篇补足到目标边数
+            k = int(rng.expovariate(1.0 / mean_refs))
+            if i == len(years) - 1:
+                k = max(0, n_edges - edges_written)
+            k = min(k, n_edges - edges_written)
+
+            # 同一篇论文不重复引用同一目标；小规模早期年份候选不足时放弃剩余名额
+            refs = set()
+            attempts = 0
+            while len(refs) < k and attempts < 4 * k:
+                attempts += 1
+                external = i == 0 or rng.random() < external_frac
+                if external:
+                    if cited_external and rng.random() < pa_prob:
+                        t = cited_external[rng.randrange(len(cited_external))]
+                    else:
+                        t = EXTERNAL_ID_BASE + n_external
+                        n_external += 1
+                else:
+                    if cited_corpus and rng.random() < pa_prob:
+                        t = cited_corpus[rng.randrange(len(cited_corpus))]
+                    else:
+                        t = CORPUS_ID_BASE + rng.randrange(i)
+                if t in refs:
+                    continue
+                refs.add(t)
+
+                if external:
+                    cited_external.append(t)
+                else:
+                    cited_corpus.append(t)
+                    counts = timeline.get(t)
+                    if counts is None:
+                        counts = timeline[t] = array("I", bytes(4 * len(YEAR_RANGE)))
+                    counts[year - YEAR_MIN] += 1
+            edges_written += len(refs)
+
+            wid = f"W{CORPUS_ID_BASE + i}"
+            title = f"Synthetic paper {i}"
+            w.writerow([
+                "Vis", year, title, f"10.0000/synthetic.{i}", abstract, f"Author {i % 997};Author {i % 991}",
+                title, f"https://openalex.org/{wid}", year,
+                str([f"https://openalex.org/W{t}" for t in sorted(refs)]),
+            ])
+
+    with open(os.path.join(out_timeline, "citation_timeline_wide.csv"), "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(["openalex_id"] + [str(y) for y in YEAR_RANGE])
+        for i in range(len(years)):
+            counts = timeline.get(CORPUS_ID_BASE + i)
+            w.writerow([f"W{CORPUS_ID_BASE + i}"] + (list(counts) if counts else [0] * len(YEAR_RANGE)))
+
+    return {"papers": len(years), "edges": edges_written, "external": n_external}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--edges", type=int, required=True, help="目标引用边数，例如 10000 ~ 10000000")
+    parser.add_argument("--root", required=True, help="输出根目录")
+    parser.add_argument("--mean-refs", type=int, default=20)
+    parser.add_argument("--external-frac", type=float, default=0.5,
+                        help="指向语料库外文献的引用比例")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    stats = generate(args.root, args.edges, mean_refs=args.mean_refs,
+                     external_frac=args.external_frac, seed=args.seed)
+    print(f"✅ Synthetic corpus → {args.root}: "
+          f"papers={stats['papers']}, edges={stats['edges']}, external={stats['external']}")
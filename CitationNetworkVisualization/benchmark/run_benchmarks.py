@@ -0,0 +1,238 @@
+# run_benchmarks.py
+# 在不同规模的合成数据上依次运行后端各阶段，记录耗时与峰值内存，便于发现扩展性断崖
+#
+# 用法：
+#   python run_benchmarks.py --scales 10000,100000,1000000,10000000
+# 每个规模会在 <workdir>/<scale>/ 下复刻仓库目录结构并复制后端脚本，互不干扰
+import os
+import sys
+import csv
+import time
+import shutil
+import socket
+import argparse
+import datetime
+import subprocess
+
+from generate_synthetic import generate
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.join(HERE, "..", "backend")
+REPO_ROOT = os.path.join(HERE, "..", "..")
+
+# (阶段名, 脚本, 额外参数)；按流水线顺序执行，前一阶段的输出是后一阶段的输入
+STAGES = [
+    ("build_citation_network", "build_citation_network.py", []),
+    ("count", "count.py", []),
+    ("split_by_year", "split_by_year.py", []),
+    ("similarity", "similarity.py", []),
+    ("community", "community.py", []),
+    ("export_json_by_year", "export_json_by_year.py", []),
+    ("search_index", "search_index.py", []),
+]
+
+RESULT_COLUMNS = ["run_at", "git_rev", "host", "scale_edges", "stage", "seconds", "peak_rss_mb", "status"]
+
+
+def _tree_rss_kb(root_pid):
+    """Linux：通过 /proc 统计进程树（含进程池 worker）的 RSS 总和（KB）；其他平台返回 None"""
+    if not os.path.isdir("/proc"):
+        return None
+    children = {}
+    for name in os.listdir("/proc"):
+        if not name.isdigit():
+            continue
+        try:
+            with open(f"/proc/{name}/stat") as f:
+                # comm 字段可能含空格，从最后一个 ')' 之后解析
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(ppid, []).append(int(name))
+
+    total, stack = 0, [root_pid]
+    while stack:
+        pid = stack.pop()
+        stack.extend(children.get(pid, []))
+        try:
+            with open(f"/proc/{pid}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1])
+                        break
+        except OSError:
+            continue
+    return total
+
+
+def run_stage(script, args, cwd, timeout):
+    """运行一个阶段，返回 (秒, 峰值 RSS MB, 状态)。
+    峰值 RSS 取两者较大值：运行期间按间隔采样的整个进程树 RSS 总和（覆盖进程池），
+    以及 os.wait4 给出的主进程 ru_maxrss（覆盖采样间隔内的短暂峰值）"""
+    start = time.perf_counter()
+    peak_tree_kb = 0
+    with open(os.path.join(cwd, f"{os.path.splitext(script)[0]}.log"), "w") as log:
+        proc = subprocess.Popen([sys.executable, script] + args, cwd=cwd,
+                                stdout=log, stderr=subprocess.STDOUT)
+        deadline = start + timeout if timeout else None
+        status_text = None
+        while True:
+            pid, status, usage = os.wait4(proc.pid, os.WNOHANG)
+            if pid:
+                break
+            peak_tree_kb = max(peak_tree_kb, _tree_rss_kb(proc.pid) or 0)
+            if deadline and time.perf_counter() > deadline:
+                proc.kill()
+                _, status, usage = os.wait4(proc.pid, 0)
+                status_text = "timeout"
+                break
+            time.sleep(0.05)
+    rss = max(_rss_mb(usage), peak_tree_kb / 1024)
+    if status_text is None:
+        code = os.waitstatus_to_exitcode(status)
+        status_text = "ok" if code == 0 else f"exit {code}"
+    return time.perf_counter() - start, rss, status_text
+
+
+def _rss_mb(usage):
+    # Linux 上 ru_maxrss 单位是 KB，macOS 上是字节
+    return usage.ru_maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def git_revision():
+    try:
+        rev = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=HERE,
+                             capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain"], cwd=HERE,
+                               capture_output=True, text=True, check=True).stdout.strip()
+        return rev + ("-dirty" if dirty else "")
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def busiest_year(backend):
+    """edges_{year}.csv 行数最多的年份，用于布局 / 绘图阶段"""
+    best, best_lines = None, -1
+    ydir = os.path.join(backend, "yearly_networks")
+    for name in os.listdir(ydir) if os.path.isdir(ydir) else []:
+        if name.startswith("edges_") and name.endswith(".csv"):
+            with open(os.path.join(ydir, name), "rb") as f:
+                n = sum(1 for _ in f)
+            if n > best_lines:
+                best, best_lines = int(name[6:-4]), n
+    return best, best_lines - 1
+
+
+def setup_scale(root, scale, seed):
+    """生成数据并复刻 <root>/CitationNetworkVisualization/backend 目录（及根目录的 corpus.py）"""
+    if os.path.exists(root):
+        shutil.rmtree(root)
+    gen_start = time.perf_counter()
+    stats = generate(root, scale, seed=seed)
+    print(f"  generated in {time.perf_counter() - gen_start:.1f}s: {stats}")
+
+    backend = os.path.join(root, "CitationNetworkVisualization", "backend")
+    os.makedirs(backend)
+    os.makedirs(os.path.join(root, "CitationNetworkVisualization", "web", "data"))
+    for name in os.listdir(BACKEND_DIR):
+        if name.endswith(".py"):
+            shutil.copy(os.path.join(BACKEND_DIR, name), backend)
+    # 后端脚本通过 ../.. 引用根目录的共享语料加载器
+    shutil.copy(os.path.join(REPO_ROOT, "corpus.py"), root)
+    return backend
+
+
+def print_table(rows, scales):
+    """阶段 × 规模 的对比表：秒 / 峰值内存"""
+    cell = {(r["stage"], r["scale_edges"]): r for r in rows}
+    stages = list(dict.fromkeys(r["stage"] for r in rows))
+    header = "| stage | " + " | ".join(f"{s:,} edges" for s in scales) + " |"
+    print("\n" + header)
+    print("|" + "---|" * (len(scales) + 1))
+    for st in stages:
+        vals = []
+        for s in scales:
+            r = cell.get((st, s))
+            if r is None:
+                vals.append("")
+            elif r["status"] != "ok":
+                vals.append(r["status"])
+            else:
+                vals.append(f"{float(r['seconds']):.2f}s / {float(r['peak_rss_mb']):.0f}MB")
+        print(f"| {st} | " + " | ".join(vals) + " |")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scales", default="10000,100000,1000000",
+                        help="逗号分隔的边数规模，例如 10000,100000,1000000,10000000")
+    parser.add_argument("--workdir", default="bench_runs")
+    parser.add_argument("--results", default="bench_results.csv")
+    parser.add_argument("--timeout", type=float, default=3600, help="单个阶段超时（秒）")
+    parser.add_argument("--max-plot-edges", type=int, default=200_000,
+                        help="年度边数超过该值时跳过 spring_layout 绘图阶段")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--workers", type=int, default=4,
+                        help="similarity.py 进程池大小；固定下来以便不同机器的结果可比")
+    parser.add_argument("--keep", action="store_true", help="保留生成的数据目录")
+    args = parser.parse_args()
+
+    scales = [int(s) for s in args.scales.split(",") if s.strip()]
+    rows = []
+    # 每次运行的标识，区分结果文件中来自不同运行 / 版本 / 机器的行
+    run_info = {
+        "run_at": datetime.datetime.now().isoformat(timespec="seconds"),
+        "git_rev": git_revision(),
+        "host": socket.gethostname(),
+    }
+
+    for scale in scales:
+        print(f"📏 Scale {scale:,} edges")
+        root = os.path.abspath(os.path.join(args.workdir, str(scale)))
+        backend = setup_scale(root, scale, args.seed)
+
+        for stage, script, extra in STAGES:
+            if stage == "similarity":
+                extra = extra + ["--workers", str(args.workers)]
+            secs, rss, status = run_stage(script, extra, backend, args.timeout)
+            rows.append({**run_info, "scale_edges": scale, "stage": stage, "seconds": f"{secs:.3f}",
+                         "peak_rss_mb": f"{rss:.1f}", "status": status})
+            print(f"  {stage:<24} {secs:8.2f}s {rss:8.0f}MB  {status}")
+            if status != "ok":
+                break
+        else:
+            # ---------- 布局 / 绘图：只跑最大的一年 ----------
+            year, n_edges = busiest_year(backend)
+            if year is None:
+                status, secs, rss = "no data", 0.0, 0.0
+            elif n_edges > args.max_plot_edges:
+                status, secs, rss = "skipped", 0.0, 0.0
+            else:
+                secs, rss, status = run_stage("plot_yearly_network.py",
+                                              ["--year", str(year), "--no-show"],
+                                              backend, args.timeout)
+            rows.append({**run_info, "scale_edges": scale, "stage": "plot_yearly_network",
+                         "seconds": f"{secs:.3f}", "peak_rss_mb": f"{rss:.1f}", "status": status})
+            print(f"  {'plot_yearly_network':<24} {secs:8.2f}s {rss:8.0f}MB  {status} (year {year}, {n_edges} edges)")
+
+        if not args.keep:
+            shutil.rmtree(root)
+
+    # 追加写入，多次运行（不同机器 / 不同版本）的结果可放在同一张表里比较
+    new_file = not os.path.exists(args.results)
+    if not new_file:
+        with open(args.results, newline="") as f:
+            header = next(csv.reader(f), None)
+        if header != RESULT_COLUMNS:
+            # 旧格式（缺少运行标识列）的结果另存，不与新行混在一起
+            os.replace(args.results, args.results + ".old")
+            print(f"⚠ {args.results} 列格式已变化，旧结果移至 {args.results}.old")
+            new_file = True
+    with open(args.results, "a", newline="") as f:
+        w = csv.DictWriter(f, fieldnames=RESULT_COLUMNS)
+        if new_file:
+            w.writeheader()
+        w.writerows(rows)
+
+    print_table(rows, scales)
+    print(f"\n✅ Results appended to {args.results}")
@@ -20,58 +20,162 @@ svg.call(zoom);
 
 const yearSelect = document.getElementById("yearSelect");
 
+// manifest.json 由 export_json_by_year.py 生成：每年的完整文件 + 相对上一年的增量文件
+let manifest = null;
+// 当前已加载的年份及其图数据（节点对象保留 x/y，供下一年复用布局）
+let current = null;
+let simulation = null;
+
 async function loadYearList() {
-  const res = await fetch("data/");
+  let years;
+  try {
+    manifest = await d3.json("data/manifest.json");
+    years = manifest.years.map(e => e.year);
+  } catch (err) {
+    // 旧的导出结果没有 manifest，退回固定年份范围
+    years = Array.from({length: 2025-1986+1}, (_,i)=>1986+i);
+  }
+  years.forEach(y=>{
+    const opt=document.createElement("option");
+    opt.value=y; opt.innerText=y;
+    yearSelect.appendChild(opt);
+  });
+}
+
+function linkKey(l) {
+  const s = typeof l.source === "object" ? l.source.id : l.source;
+  const t = typeof l.target === "object" ? l.target.id : l.target;
+  return `${s}->${t}`;
+}
+
+// 在上一年的图上应用增量，得到新一年的图；未变化的节点沿用原对象（含位置）
+function applyDelta(prev, delta) {
+  const removed = new Set(delta.nodes_removed);
+  const changed = new Map(delta.nodes_changed.map(n => [n.id, n]));
+  const nodes = prev.nodes
+    .filter(n => !removed.has(n.id))
+    // 属性变化的节点复制一份（保留 x/y），不修改仍在显示的上一年图
+    .map(n => changed.has(n.id) ? {...n, ...changed.get(n.id)} : n)
+    .concat(delta.nodes_added.map(n => ({...n})));
+
+  // 相邻年份的边不相交时，增量直接给出本年全部边
+  if (delta.links) return {nodes, links: delta.links.map(l => ({...l}))};
+
+  // 边按多重集删除
+  const toRemove = new Map();
+  delta.links_removed.forEach(l => {
+    const k = linkKey(l);
+    toRemove.set(k, (toRemove.get(k) || 0) + 1);
+  });
+  const links = [];
+  prev.links.forEach(l => {
+    const k = linkKey(l);
+    if (toRemove.get(k)) {
+      toRemove.set(k, toRemove.get(k) - 1);
+      return;
+    }
+    links.push({source: l.source.id ?? l.source, target: l.target.id ?? l.target});
+  });
+  delta.links_added.forEach(l => links.push({...l}));
+
+  return {nodes, links};
+}
+
+async function fetchYear(year) {
+  const entry = manifest && manifest.years.find(e => e.year === +year);
+  // 在 await 之前固定基准图；等待期间 current 可能被其他加载修改
+  const base = current;
+  if (entry && entry.delta && base && base.year === entry.delta.base) {
+    const delta = await d3.json(`data/${entry.delta.file}`);
+    return applyDelta(base.data, delta);
+  }
+  return d3.json(`data/${entry ? entry.file : year + ".json"}`);
 }
 
-function loadYear(year) {
+// 每次加载递增；快速切换年份时丢弃已被后续请求取代的结果
+let loadSeq = 0;
+
+// 两年共有的节点沿用屏幕上已有的位置（无论本年是否由增量构建），返回沿用的节点数
+function seedPositions(prev, data) {
+  const pos = new Map(prev.nodes.map(n => [n.id, n]));
+  let seeded = 0;
+  data.nodes.forEach(n => {
+    const p = pos.get(n.id);
+    if (!p || p.x === undefined) return;
+    // 增量构建时未变化的节点就是原对象，本身已有位置
+    if (p !== n) {
+      n.x = p.x;
+      n.y = p.y;
+    }
+    seeded++;
+  });
+  return seeded;
+}
+
+async function loadYear(year) {
+  const seq = ++loadSeq;
+  const data = await fetchYear(year);
+  if (seq !== loadSeq) return;
+  const seeded = current ? seedPositions(current.data, data) : 0;
+  current = {year: +year, data};
+
   // 只清除容器内容，保留缩放状态
   container.selectAll("*").remove();
+  if (simulation) simulation.stop();
 
-  d3.json(`data/${year}.json`).then(data => {
-
-    const nodes = data.nodes;
-    const links = data.links;
-
-    const simulation = d3.forceSimulation(nodes)
-      .force("link", d3.forceLink(links).id(d => d.id).distance(80))
-      .force("charge", d3.forceManyBody().strength(-120))
-      .force("center", d3.forceCenter(width / 2, height / 2));
-
-    // 将链接和节点都添加到容器中
-    const link = container.append("g")
-      .attr("stroke", "#333333")
-      .selectAll("line")
-      .data(links)
-      .join("line")
-      .attr("stroke-width", 1)
-      .attr("opacity", 0.4);
-
-    const node = container.append("g")
-      .selectAll("circle")
-      .data(nodes)
-      .join("circle")
-      .attr("r", d => Math.max(3, Math.sqrt(d.citations)))
-      .attr("fill", d => d3.interpolateViridis(d.citations / 60))
-      .call(drag(simulation));
-
-    node.append("title")
-      .text(d => `ID: ${d.id}\nCitations: ${d.citations}`);
-
-    simulation.on("tick", () => {
-      link
-        .attr("x1", d => d.source.x)
-        .attr("y1", d => d.source.y)
-        .attr("x2", d => d.target.x)
-        .attr("y2", d => d.target.y);
-
-      node
-        .attr("cx", d => d.x)
-        .attr("cy", d => d.y);
-    });
+  const nodes = data.nodes;
+  const links = data.links;
+
+  simulation = d3.forceSimulation(nodes)
+    .force("link", d3.forceLink(links).id(d => d.id).distance(80))
+    .force("charge", d3.forceManyBody().strength(-120))
+    .force("center", d3.forceCenter(width / 2, height / 2));
+
+  // 共有节点已有位置，只需小幅调整
+  if (seeded) simulation.alpha(0.3);
+
+  // 将链接和节点都添加到容器中
+  const link = container.append("g")
+    .attr("stroke", "#333333")
+    .selectAll("line")
+    .data(links)
+    .join("line")
+    .attr("stroke-width", 1)
+    .attr("opacity", 0.4);
+
+  const node = container.append("g")
+    .selectAll("circle")
+    .data(nodes)
+    .join("circle")
+    .attr("r", d => Math.max(3, Math.sqrt(d.citations)))
+    .attr("fill", nodeColor)
+    .call(drag(simulation));
+
+  node.append("title")
+    .text(d => `ID: ${d.id}\nCitations: ${d.citations}` +
+      (d.community !== undefined ? `\nCommunity: ${d.community}` : ""));
+
+  simulation.on("tick", () => {
+    link
+      .attr("x1", d => d.source.x)
+      .attr("y1", d => d.source.y)
+      .attr("x2", d => d.target.x)
+      .attr("y2", d => d.target.y);
+
+    node
+      .attr("cx", d => d.x)
+      .attr("cy", d => d.y);
   });
 }
 
+// 有社区 ID 时按社区着色（跨年份 ID 稳定，颜色也保持一致），否则按引用数着色
+const communityColor = d3.scaleOrdinal(d3.schemeTableau10);
+
+function nodeColor(d) {
+  if (d.community !== undefined) return communityColor(d.community % 10);
+  return d3.interpolateViridis(d.citations / 60);
+}
+
 function drag(simulation) {
   return d3.drag()
     .on("start", event => {
@@ -94,13 +198,135 @@ function drag(simulation) {
     });
 }
 
-// init years
-const years = Array.from({length: 2025-1986+1}, (_,i)=>1986+i);
-years.forEach(y=>{
-  const opt=document.createElement("option");
-  opt.value=y; opt.innerText=y;
-  yearSelect.appendChild(opt);
-});
+// ---------- 标题搜索（search.json 由 search_index.py 生成） ----------
+const searchBox = document.getElementById("searchBox");
+const searchResults = document.getElementById("searchResults");
+let searchShard = null;
 
+// 与 search_index.tokenize 一致：NFKD 后去掉所有标记类字符（Unicode 类别 M*）
+function tokenize(text) {
+  return text.normalize("NFKD").replace(/\p{M}/gu, "").toLowerCase()
+    .match(/[a-z0-9]+/g) || [];
+}
+
+// 前缀展开：与 SearchIndex._terms 相同，只保留文档频率最高的 max_prefix_terms 个词
+function prefixTerms(s, tok) {
+  const lo = d3.bisectLeft(s.vocab, tok);
+  const hi = d3.bisectLeft(s.vocab, tok + "\uffff");
+  const terms = d3.range(lo, hi);
+  const limit = s.params.max_prefix_terms;
+  if (terms.length <= limit) return terms;
+  // Array.prototype.sort 是稳定排序，文档频率相同时保持词表顺序
+  return terms.sort((a, b) => s.postings[b].length - s.postings[a].length).slice(0, limit);
+}
+
+// 与 SearchIndex.search 相同的 BM25；最后一个词按前缀匹配，同分按文档下标排序
+function searchTitles(query, k = 10) {
+  const s = searchShard;
+  const {k1, b} = s.params;
+  const tokens = tokenize(query);
+  const n = s.docs.length;
+  const scores = new Map();
+  tokens.forEach((tok, j) => {
+    let terms;
+    if (j === tokens.length - 1) {
+      terms = prefixTerms(s, tok);
+    } else {
+      const t = d3.bisectLeft(s.vocab, tok);
+      terms = s.vocab[t] === tok ? [t] : [];
+    }
+    terms.forEach(t => {
+      const p = s.postings[t];
+      const df = p.length / 2;
+      const idf = Math.log(1 + (n - df + 0.5) / (df + 0.5));
+      for (let i = 0; i < p.length; i += 2) {
+        const doc = p[i], tf = p[i + 1];
+        const norm = k1 * (1 - b + b * s.doc_len[doc] / s.avgdl);
+        scores.set(doc, (scores.get(doc) || 0) + idf * tf * (k1 + 1) / (tf + norm));
+      }
+    });
+  });
+  return Array.from(scores)
+    .sort((x, y) => y[1] - x[1] || x[0] - y[0])
+    .slice(0, k)
+    .map(([doc]) => s.docs[doc]);
+}
+
+function showSearchMessage(text) {
+  searchResults.innerHTML = "";
+  const li = document.createElement("li");
+  li.innerText = text;
+  searchResults.appendChild(li);
+}
+
+// 切换到论文发表年份并高亮对应节点；该年份没有导出的图时给出提示
+async function showPaper(wid, year) {
+  // 有 manifest 时以其为准；旧导出没有 manifest，只能按下拉框中的年份判断
+  const available = year !== null && (manifest
+    ? manifest.years.some(e => e.year === year)
+    : Array.from(yearSelect.options).some(o => +o.value === year));
+  if (!available) {
+    showSearchMessage(`No citation graph exported for ${year ?? "unknown year"}`);
+    return;
+  }
+  if (+yearSelect.value !== year) {
+    yearSelect.value = year;
+    try {
+      await loadYear(year);
+    } catch (err) {
+      showSearchMessage(`Failed to load ${year}: ${err.message}`);
+      return;
+    }
+  }
+  container.selectAll("circle")
+    .attr("stroke", d => d.id === wid ? "#d62728" : null)
+    .attr("stroke-width", d => d.id === wid ? 3 : null);
+}
+
+// 首次聚焦时加载索引（只发一次请求）；加载失败给出提示，下次聚焦时重试
+let searchShardLoading = null;
+let searchShardError = null;
+
+searchBox.onfocus = async () => {
+  if (searchShard || searchShardLoading) return;
+  searchShardLoading = d3.json("data/search.json");
+  try {
+    searchShard = await searchShardLoading;
+    searchShardError = null;
+  } catch (err) {
+    searchShardError = `Search index unavailable (${err.message}); run backend/search_index.py to build data/search.json`;
+  } finally {
+    searchShardLoading = null;
+  }
+  if (searchShardError) {
+    showSearchMessage(searchShardError);
+  } else {
+    // 加载期间已输入的内容立即搜索，不必等下一次按键
+    searchBox.oninput();
+  }
+};
+
+searchBox.oninput = () => {
+  searchResults.innerHTML = "";
+  if (!searchBox.value.trim()) return;
+  if (!searchShard) {
+    if (searchShardError) showSearchMessage(searchShardError);
+    return;
+  }
+  searchTitles(searchBox.value).forEach(([wid, year, title]) => {
+    const li = document.createElement("li");
+    li.innerText = `${title} (${year ?? "?"})`;
+    li.onclick = () => {
+      searchResults.innerHTML = "";
+      showPaper(wid, year);
+    };
+    searchResults.appendChild(li);
+  });
+};
+
+// init years
 yearSelect.onchange = () => loadYear(yearSelect.value);
-loadYear(1990);
+loadYearList().then(() => {
+  yearSelect.value = 1990;
+  loadYear(1990);
+});
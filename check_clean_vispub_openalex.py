@@ -6,6 +6,8 @@ import re
 import pandas as pd
 from difflib import SequenceMatcher
 
+from corpus import read_typed_csv
+
 # ---------- 配置 ----------
 VISPUB_CSV = "vispubs.csv"
 OA_CSV = "vispub_with_openalex.csv"
@@ -14,8 +16,10 @@ OUTPUT_DIR = "output_cleaned"
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
 # ---------- 读取 CSV ----------
-vispub = pd.read_csv(VISPUB_CSV)
-oa = pd.read_csv(OA_CSV)
+# 输出需要保留全部列，因此不做列投影；只收紧 dtype 并使用缓存快照
+# （ID / DOI 列之后会被就地清洗，保持 object 类型）
+vispub = read_typed_csv(VISPUB_CSV, dtypes={"conference": "category", "year": "Int16"})
+oa = read_typed_csv(OA_CSV, dtypes={"publication_year": "Int16", "cited_by_count": "Int32"})
 
 # ---------- 给 OpenAlex 所有列加前缀 ----------
 oa = oa.add_prefix("oa_")
@@ -134,9 +138,9 @@ df["title_similarity"] = df.apply(lambda r: compute_similarity(r.get("title", ""
 df["oa_referenced_works_parsed"] = df["oa_referenced_works"].apply(parse_referenced_works) if "oa_referenced_works" in df else [[]]*len(df)
 df["ref_count"] = df["oa_referenced_works_parsed"].apply(len)
 
-df["year_consistent"] = df.apply(
-    lambda r: abs(int(r["year"]) - int(r["oa_publication_year"])) <= 1 
-        if not (pd.isna(r["year"]) or pd.isna(r["oa_publication_year"])) else False, axis=1)
+df["year_consistent"] = (
+    (df["year"].astype("Int32") - df["oa_publication_year"].astype("Int32")).abs() <= 1
+).fillna(False).astype(bool)
 
 df["author_overlap"] = df.apply(lambda r: author_overlap(r.get("authorNamesDeduped", ""), r.get("oa_authorships", "")), axis=1)
 
@@ -0,0 +1,93 @@
+# corpus.py — 清洗后语料的共享加载：按阶段列投影 + 紧凑 dtype + 缓存快照
+#
+#   from corpus import load_corpus
+#   df = load_corpus("network")      # 只读 oa_openalex_id / year / oa_referenced_works_parsed
+#
+# 快照以源文件内容的 SHA-1 为键（pickle 保留 category / Int16 等 dtype），
+# 源文件不变时直接读取快照，跳过 CSV 解析
+import os
+import hashlib
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+CORPUS_FILE = os.path.join(ROOT, "output_cleaned", "vispub_final.csv")
+CACHE_DIR_NAME = ".corpus_cache"
+
+# 各阶段实际用到的列；authorships / abstract 等大字段只有在明确需要时才读取
+STAGE_COLUMNS = {
+    "timeline": ["oa_openalex_id", "year"],
+    "network": ["oa_openalex_id", "year", "oa_referenced_works_parsed"],
+    "search": ["oa_openalex_id", "year", "title", "authorNamesDeduped"],
+}
+
+# 低基数 / ID 列用 category，年份用可空 Int16，计数用可空 Int32
+DTYPES = {
+    "conference": "category",
+    "oa_openalex_id": "category",
+    "year": "Int16",
+    "oa_publication_year": "Int16",
+    "oa_cited_by_count": "Int32",
+    "ref_count": "Int32",
+}
+
+_NUMERIC = {"Int8", "Int16", "Int32", "Int64"}
+
+
+def file_hash(path, chunk_size=1 << 20):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(chunk_size), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def read_typed_csv(path, columns=None, dtypes=None, cache=True):
+    """读取 CSV 并转换为紧凑 dtype。
+    columns 为 None 时读取全部列；不存在的列会被忽略（由调用方做必需列检查）。
+    dtypes 中的数值类型在读入后用 to_numeric(errors="coerce") 转换，其余直接交给 read_csv。
+    """
+    dtypes = dict(dtypes or {})
+    header = pd.read_csv(path, nrows=0).columns
+    usecols = list(header) if columns is None else [c for c in columns if c in header]
+    dtypes = {c: t for c, t in dtypes.items() if c in usecols}
+
+    snapshot = None
+    if cache:
+        cache_dir = os.path.join(os.path.dirname(os.path.abspath(path)), CACHE_DIR_NAME)
+        stem = os.path.splitext(os.path.basename(path))[0]
+        spec = hashlib.sha1(repr((usecols, sorted(dtypes.items()))).encode()).hexdigest()[:8]
+        snapshot = os.path.join(cache_dir, f"{stem}-{spec}-{file_hash(path)[:16]}.pkl")
+        if os.path.exists(snapshot):
+            return pd.read_pickle(snapshot)
+
+    df = pd.read_csv(
+        path,
+        usecols=usecols,
+        dtype={c: t for c, t in dtypes.items() if t not in _NUMERIC},
+    )
+    for c, t in dtypes.items():
+        if t in _NUMERIC:
+            df[c] = pd.to_numeric(df[c], errors="coerce").astype(t)
+
+    if snapshot:
+        os.makedirs(cache_dir, exist_ok=True)
+        # 先写临时文件再原子替换，多个进程同时加载时不会读到半个快照
+        tmp = f"{snapshot}.{os.getpid()}.tmp"
+        df.to_pickle(tmp)
+        os.replace(tmp, snapshot)
+        # 同一列配置的旧快照（源文件已变化）直接删除；另一个进程可能已先删掉，忽略即可
+        for name in os.listdir(cache_dir):
+            if (name.startswith(f"{stem}-{spec}-") and name.endswith(".pkl")
+                    and name != os.path.basename(snapshot)):
+                try:
+                    os.remove(os.path.join(cache_dir, name))
+                except FileNotFoundError:
+                    pass
+    return df
+
+
+def load_corpus(stage=None, columns=None, path=CORPUS_FILE, cache=True):
+    """按阶段（见 STAGE_COLUMNS）或显式列名加载清洗后的语料"""
+    if columns is None and stage is not None:
+        columns = STAGE_COLUMNS[stage]
+    return read_typed_csv(path, columns=columns, dtypes=DTYPES, cache=cache)
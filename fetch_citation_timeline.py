@@ -4,10 +4,15 @@ import time
 import json
 import csv
 import re
+import socket
+import argparse
 import requests
 import pandas as pd
 from tqdm import tqdm
 
+import work_queue
+from corpus import load_corpus
+
 INPUT_FILE = "output_cleaned/vispub_final.csv"
 
 # 输出路径
@@ -28,9 +33,22 @@ HEADERS = {"User-Agent": "YourName/1.0 (mailto:xzxq1027@gmail.com)"}
 
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
+# ---------- CLI ----------
+# 不带参数：单进程顺序抓取（原有行为）
+# --queue init   : 把待抓取的 work ID 写入共享队列
+# --queue work   : 作为 worker 领取任务（可在同一台机器上同时运行多个进程）
+# --queue export : 把队列中的结果合并进宽表 CSV
+parser = argparse.ArgumentParser()
+parser.add_argument("--queue", choices=["init", "work", "export"])
+parser.add_argument("--db", default=os.path.join(OUTPUT_DIR, "queue.sqlite"))
+parser.add_argument("--worker", default=f"{socket.gethostname()}-{os.getpid()}")
+parser.add_argument("--batch", type=int, default=20)
+args = parser.parse_args()
+
 
 # ---------- load cleaned data ----------
-df = pd.read_csv(INPUT_FILE)
+# 只需要 ID 和年份两列，其余大字段不读
+df = load_corpus("timeline", path=INPUT_FILE)
 # 倒序扫描，先扫描旧年份的引用记录
 df = df.iloc[::-1].reset_index(drop=True)
 
@@ -46,15 +64,15 @@ def normalize_to_wid(raw):
     m = re.search(r"W\d+", str(raw))
     return m.group(0) if m else None
 
-df["oa_wid"] = df["oa_openalex_id"].apply(normalize_to_wid)
+df["oa_wid"] = df["oa_openalex_id"].map(normalize_to_wid).astype(object)
 all_wids = list(df["oa_wid"].dropna().unique())
 
 print(f"📌 Total works = {len(all_wids)}")
 
 # ID -> Pub Year 映射
 pub_year_map = {
-    row["oa_wid"]: int(row["year"]) if not pd.isna(row["year"]) else None
-    for idx, row in df.iterrows()
+    wid: int(year) if not pd.isna(year) else None
+    for wid, year in zip(df["oa_wid"], df["year"])
 }
 
 # ---------- Load existing wide CSV ----------
@@ -147,32 +165,95 @@ def parse_timeline(obj, wid, pub_year):
     return rows
 
 
-# ---------- Main loop ----------
-for wid in tqdm(all_wids):
-
-    if wid in existing_ids:
-        continue
-    if wid in failed_ids:
-        continue
-
-    pub_year = pub_year_map.get(wid, None)
-
+# ---------- Fetch one work ----------
+def fetch_timeline(wid):
+    """依次尝试各个 endpoint，返回 (payload, reason)；全部失败时 payload 为 None"""
     endpoints = [
         f"https://api.openalex.org/works/{wid}/citations?group_by=year",
         f"https://api.openalex.org/works/{wid}/citation-timeline",
         f"https://api.openalex.org/works/{wid}"
     ]
 
-    payload = None
     reason = None
-
     for url in endpoints:
         status, res = fetch_with_retries(url)
         if status == "ok":
-            payload = res
+            return res, None
+        reason = res
+    return None, reason
+
+
+def build_row(wid, rows):
+    row = {"openalex_id": wid}
+    for y in YEAR_RANGE:
+        row[str(y)] = rows.get(y, 0)
+    return row
+
+
+# ---------- Queue mode（本机多进程分摊抓取） ----------
+if args.queue == "init":
+    conn = work_queue.open_queue(args.db)
+    added = work_queue.enqueue(conn, [w for w in all_wids if w not in existing_ids])
+    # 历史失败记录不再永久跳过：重新入队，由 worker 按重试次数处理
+    revived = work_queue.retry_failed(conn)
+    print(f"📥 Enqueued {added} new works, revived {revived} failed, stats={work_queue.queue_stats(conn)}")
+    raise SystemExit(0)
+
+if args.queue == "export":
+    conn = work_queue.open_queue(args.db)
+    new_rows = [build_row(wid, {int(y): c for y, c in rows.items()})
+                for wid, rows in work_queue.iter_results(conn) if wid not in existing_ids]
+    if new_rows:
+        wide_df = pd.concat([wide_df, pd.DataFrame(new_rows)], ignore_index=True)
+    save_wide(wide_df)
+    print(f"📤 Exported {len(new_rows)} new rows → {WIDE_CSV}, stats={work_queue.queue_stats(conn)}")
+    raise SystemExit(0)
+
+if args.queue == "work":
+    conn = work_queue.open_queue(args.db)
+    raw_file = os.path.join(OUTPUT_DIR, f"citation_timeline_raw.{args.worker}.jsonl")
+    print(f"👷 Worker {args.worker} on {args.db}")
+
+    while True:
+        batch = work_queue.lease_batch(conn, args.worker, args.batch)
+        if not batch:
             break
-        else:
-            reason = res
+
+        for wid in batch:
+            # 续租；前面的任务耗时过长导致租约被他人接管时跳过
+            if not work_queue.renew(conn, wid, args.worker):
+                continue
+            payload, reason = fetch_timeline(wid)
+            if payload is None:
+                work_queue.fail(conn, wid, reason, args.worker)
+                print(f"❌ Failed {wid}, reason={reason}")
+                continue
+
+            # 每个 worker 写自己的 raw 文件，避免多进程追加同一文件
+            with open(raw_file, "a", encoding="utf-8") as f:
+                f.write(json.dumps(payload) + "\n")
+
+            rows = parse_timeline(payload, wid, pub_year_map.get(wid, None))
+            work_queue.complete(conn, wid, rows, args.worker)
+            print(f"✔ {wid}: years={len(rows)}, total={sum(rows.values())}")
+
+            time.sleep(SLEEP_BETWEEN_REQUESTS)
+
+    print(f"\n🎉 Queue drained. stats={work_queue.queue_stats(conn)}")
+    raise SystemExit(0)
+
+
+# ---------- Main loop ----------
+for wid in tqdm(all_wids):
+
+    if wid in existing_ids:
+        continue
+    if wid in failed_ids:
+        continue
+
+    pub_year = pub_year_map.get(wid, None)
+
+    payload, reason = fetch_timeline(wid)
 
     if payload is None:
         with open(FAILED_FILE, "a", newline='', encoding="utf-8") as f:
@@ -189,9 +270,7 @@ for wid in tqdm(all_wids):
     rows = parse_timeline(payload, wid, pub_year)
 
     # build row
-    row = {"openalex_id": wid}
-    for y in YEAR_RANGE:
-        row[str(y)] = rows.get(y, 0)
+    row = build_row(wid, rows)
 
     # append
     wide_df = pd.concat([wide_df, pd.DataFrame([row])], ignore_index=True)
@@ -4,18 +4,31 @@ import urllib.parse
 import time
 import json
 import os
+import socket
+import argparse
+
+import work_queue
 
 # -----------------------------
 # 搜索函数（与你原来的基本一致）
 # -----------------------------
-def search_openalex_by_title(title):
+def search_openalex_by_title(title, raise_errors=False):
     query = urllib.parse.quote(title)
     url = f"https://api.openalex.org/works?filter=title.search:{query}"
 
     try:
-        r = requests.get(url, timeout=10).json()
+        resp = requests.get(url, timeout=10)
+        # 429 / 5xx 等返回的 JSON 没有 results，不能当作“未找到”
+        if resp.status_code != 200:
+            if resp.status_code == 429:
+                time.sleep(10)
+            raise RuntimeError(("http_error", resp.status_code))
+        r = resp.json()
     except Exception as e:
-        print("  ⚠ 网络错误:", e)
+        print("  ⚠ 请求失败:", e)
+        # 队列模式下请求失败需要区分于“未找到”，交给 work_queue.fail() 计数重试
+        if raise_errors:
+            raise
         return None
 
     if "results" in r and len(r["results"]) > 0:
@@ -31,6 +44,31 @@ def search_openalex_by_title(title):
     return None
 
 
+def empty_record(title):
+    return {
+        "title": title,
+        "openalex_id": None,
+        "doi": None,
+        "cited_by_count": None,
+        "publication_year": None,
+        "referenced_works": None
+    }
+
+
+# -----------------------------
+# 命令行参数
+#   不带参数     : 单进程顺序爬取（原有行为）
+#   --queue init : 把剩余行号写入共享队列
+#   --queue work : 作为 worker 领取任务（可在同一台机器上多进程同时运行）
+#   --queue export : 队列全部完成后按原顺序追加到输出 CSV
+# -----------------------------
+parser = argparse.ArgumentParser()
+parser.add_argument("--queue", choices=["init", "work", "export"])
+parser.add_argument("--db", default="vispub_with_openalex.queue.sqlite")
+parser.add_argument("--worker", default=f"{socket.gethostname()}-{os.getpid()}")
+parser.add_argument("--batch", type=int, default=20)
+args = parser.parse_args()
+
 # -----------------------------
 # 加载进度文件 progress.json
 # -----------------------------
@@ -62,6 +100,60 @@ if not os.path.exists(output_file):
     out_df.to_csv(output_file, index=False)
 
 
+# -----------------------------
+# 队列模式：行号作为任务 key，结果写回队列数据库
+# -----------------------------
+if args.queue == "init":
+    conn = work_queue.open_queue(args.db)
+    added = work_queue.enqueue(conn, range(progress["index"], total))
+    print(f"📥 入队 {added} 条（从 {progress['index']}/{total}），状态: {work_queue.queue_stats(conn)}")
+    raise SystemExit(0)
+
+if args.queue == "work":
+    conn = work_queue.open_queue(args.db)
+    print(f"👷 Worker {args.worker} on {args.db}")
+    while True:
+        batch = work_queue.lease_batch(conn, args.worker, args.batch)
+        if not batch:
+            break
+        for key in batch:
+            # 续租；租约已被其他 worker 接管时跳过
+            if not work_queue.renew(conn, key, args.worker):
+                continue
+            title = df.loc[int(key), "title"]
+            print(f"[{int(key)+1}/{total}] Searching OpenAlex: {title}")
+            try:
+                data = search_openalex_by_title(title, raise_errors=True)
+            except Exception as e:
+                work_queue.fail(conn, key, e, args.worker)
+                continue
+            work_queue.complete(conn, key, data if data is not None else empty_record(title), args.worker)
+            time.sleep(0.5)
+    print(f"\n队列已清空，状态: {work_queue.queue_stats(conn)}")
+    raise SystemExit(0)
+
+if args.queue == "export":
+    conn = work_queue.open_queue(args.db)
+    stats = work_queue.queue_stats(conn)
+    if stats.get("pending") or stats.get("leased"):
+        raise SystemExit(f"队列尚未完成，状态: {stats}")
+
+    # 输出 CSV 与 vispubs.csv 按行位置对齐，必须按行号顺序写出；
+    # 多次重试仍失败的行与单进程模式一样写入空记录
+    results = {int(k): v for k, v in work_queue.iter_results(conn)}
+    missing = [i for i in range(progress["index"], total) if i not in results]
+    rows = [results.get(i) or empty_record(df.loc[i, "title"])
+            for i in range(progress["index"], total)]
+    pd.DataFrame(rows, columns=list(empty_record(None))).to_csv(
+        output_file, mode="a", header=False, index=False)
+
+    progress["index"] = total
+    with open(progress_file, "w") as f:
+        json.dump(progress, f)
+    print(f"已追加 {len(rows)} 条到 {output_file}（其中 {len(missing)} 条失败记为空）")
+    raise SystemExit(0)
+
+
 print(f"从进度 {progress['index']}/{total} 继续爬取...\n")
 
 
@@ -77,14 +169,7 @@ for i in range(progress["index"], total):
 
     if data is None:
         print("  ❌ Not found")
-        data = {
-            "title": title,
-            "openalex_id": None,
-            "doi": None,
-            "cited_by_count": None,
-            "publication_year": None,
-            "referenced_works": None
-        }
+        data = empty_record(title)
     else:
         print(f"  ✔ Found: {data['openalex_id']}, DOI={data['doi']}")
 
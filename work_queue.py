@@ -0,0 +1,137 @@
+# work_queue.py — 基于 SQLite 的共享任务队列（租约 / 过期重发 / 重试计数）
+# 同一台机器上的多个爬虫进程可同时从同一个队列领取任务
+# 注意：数据库使用 WAL 日志，必须放在本地磁盘上，不能放在 NFS / SMB 等网络文件系统中
+import os
+import json
+import time
+import sqlite3
+
+LEASE_SECONDS = 300
+MAX_ATTEMPTS = 5
+
+# status: pending → leased → done
+#                          ↘ pending（失败或租约过期，未超过 MAX_ATTEMPTS）/ failed
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    key          TEXT PRIMARY KEY,
+    seq          INTEGER NOT NULL,
+    status       TEXT NOT NULL DEFAULT 'pending',
+    worker       TEXT,
+    lease_until  REAL,
+    attempts     INTEGER NOT NULL DEFAULT 0,
+    last_error   TEXT,
+    result       TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_items_status ON items (status, seq);
+"""
+
+
+def open_queue(path):
+    """打开（或创建）队列数据库。WAL 模式允许读写并发，timeout 让写锁冲突时等待而不是报错"""
+    d = os.path.dirname(path)
+    if d:
+        os.makedirs(d, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=60, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def enqueue(conn, keys):
+    """加入任务；已存在的 key 保持原状态（可重复执行），返回新增数量"""
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        start = conn.execute("SELECT COALESCE(MAX(seq), -1) + 1 FROM items").fetchone()[0]
+        before = conn.total_changes
+        conn.executemany(
+            "INSERT OR IGNORE INTO items (key, seq) VALUES (?, ?)",
+            ((str(k), start + i) for i, k in enumerate(keys)),
+        )
+        added = conn.total_changes - before
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    return added
+
+
+def lease_batch(conn, worker, n, lease_seconds=LEASE_SECONDS, max_attempts=MAX_ATTEMPTS):
+    """原子地领取最多 n 个任务：pending 的，或租约已过期（进程崩溃 / 被杀 / 卡住）的。
+    租约过期与 fail() 一样计一次失败，达到 max_attempts 的任务标记为 failed，不再领取"""
+    now = time.time()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.execute(
+            "UPDATE items SET attempts = attempts + 1, last_error = 'lease expired', "
+            "lease_until = NULL, "
+            "status = CASE WHEN attempts + 1 >= ? THEN 'failed' ELSE 'pending' END "
+            "WHERE status = 'leased' AND lease_until < ?",
+            (max_attempts, now),
+        )
+        rows = conn.execute(
+            "SELECT key FROM items WHERE status = 'pending' ORDER BY seq LIMIT ?",
+            (n,),
+        ).fetchall()
+        keys = [r[0] for r in rows]
+        conn.executemany(
+            "UPDATE items SET status = 'leased', worker = ?, lease_until = ? WHERE key = ?",
+            ((worker, now + lease_seconds, k) for k in keys),
+        )
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    return keys
+
+
+def renew(conn, key, worker, lease_seconds=LEASE_SECONDS):
+    """处理单个任务前续租；返回 False 表示租约已过期并被其他 worker 领走，应跳过该任务"""
+    cur = conn.execute(
+        "UPDATE items SET lease_until = ? WHERE key = ? AND worker = ? AND status = 'leased'",
+        (time.time() + lease_seconds, str(key), worker),
+    )
+    return cur.rowcount == 1
+
+
+def complete(conn, key, result, worker):
+    """写回结果（任意可 JSON 序列化的对象）；只有仍持有租约的 worker 才能写入"""
+    cur = conn.execute(
+        "UPDATE items SET status = 'done', result = ?, lease_until = NULL, last_error = NULL "
+        "WHERE key = ? AND worker = ? AND status = 'leased'",
+        (json.dumps(result, ensure_ascii=False), str(key), worker),
+    )
+    return cur.rowcount == 1
+
+
+def fail(conn, key, reason, worker, max_attempts=MAX_ATTEMPTS):
+    """记录一次失败；未达到 max_attempts 时重新放回 pending，之后由任意 worker 重试。
+    租约已被他人接管（甚至已完成）时不做任何修改"""
+    cur = conn.execute(
+        "UPDATE items SET attempts = attempts + 1, last_error = ?, lease_until = NULL, "
+        "status = CASE WHEN attempts + 1 >= ? THEN 'failed' ELSE 'pending' END "
+        "WHERE key = ? AND worker = ? AND status = 'leased'",
+        (str(reason), max_attempts, str(key), worker),
+    )
+    return cur.rowcount == 1
+
+
+def retry_failed(conn):
+    """把永久失败的任务重新放回队列（重置重试计数），返回数量"""
+    cur = conn.execute(
+        "UPDATE items SET status = 'pending', attempts = 0 WHERE status = 'failed'"
+    )
+    return cur.rowcount
+
+
+def queue_stats(conn):
+    """{status: count}"""
+    return dict(conn.execute("SELECT status, COUNT(*) FROM items GROUP BY status").fetchall())
+
+
+def iter_results(conn):
+    """按入队顺序遍历已完成任务的 (key, result)"""
+    for key, result in conn.execute(
+        "SELECT key, result FROM items WHERE status = 'done' ORDER BY seq"
+    ):
+        yield key, json.loads(result)